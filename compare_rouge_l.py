@@ -5,16 +5,76 @@ Performance and accuracy comparison between Java and Rust ROUGE-L implementation
 
 import subprocess
 import time
-import json
 import os
-import re
-import statistics
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from collections import defaultdict
+
+import numpy as np
+
+try:
+    import orjson as json_parser  # Optional; several times faster than the stdlib parser
+except ImportError:
+    import json as json_parser
 
 # Get the script's directory to use as base for relative paths
 SCRIPT_DIR = Path(__file__).parent.absolute()
 
+# Java classes are run from a jar: AppCDS only archives application classes loaded
+# from JAR files and refuses to dump with a non-empty directory on the classpath
+JAVA_JAR = SCRIPT_DIR / "rouge_l_java" / "rougel.jar"
+
+# AppCDS archive reused by every Java run to skip class loading and verification
+JAVA_CDS_ARCHIVE = SCRIPT_DIR / "rouge_l_java" / "rougel.jsa"
+
+# JVM flag profiles. Steady state gives C2 an extended warmup to compile the hot
+# path before measuring; C1-only stops tiered compilation at C1. JVM startup is
+# excluded from worker timings either way, so both measure warmed-up code.
+JAVA_OPTS_C1_ONLY = ["-XX:TieredStopAtLevel=1", "-Xshare:auto"]
+JAVA_OPTS_STEADY_STATE = ["-Xshare:auto"]
+
+# Profile name -> (JVM flags, warmup iterations); selected with ROUGE_L_JAVA_PROFILE
+JAVA_PROFILES = {
+    "steady-state": (JAVA_OPTS_STEADY_STATE, 10),
+    "c1-only": (JAVA_OPTS_C1_ONLY, 2),
+}
+
+# Times are kept as integer nanoseconds and only converted for display
+NS_PER_MS = 1_000_000
+
+# Measurement stops early once the last CV_WINDOW samples vary by less than the CV target
+CV_WINDOW = 5
+
+def executable(name):
+    """Resolve a program to an absolute path.
+    
+    subprocess only takes its posix_spawn fast path (instead of fork + exec) when the
+    executable has a directory component, close_fds is False and cwd/preexec_fn are unset.
+    """
+    return shutil.which(name) or name
+
+def iter_source_mtimes(paths):
+    """Yield the modification time (ns) of every file under the given files/directories"""
+    for path in paths:
+        if os.path.isdir(path):
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from iter_source_mtimes([entry.path])
+                    elif entry.is_file():
+                        yield entry.stat().st_mtime_ns
+        elif os.path.isfile(path):
+            yield os.stat(path).st_mtime_ns
+
+def is_up_to_date(target, sources):
+    """Return True when target exists and is newer than every source file"""
+    try:
+        target_mtime = os.stat(target).st_mtime_ns
+    except FileNotFoundError:
+        return False
+    
+    return all(mtime <= target_mtime for mtime in iter_source_mtimes(sources))
+
 def compile_java():
     """Compile Java implementation"""
     java_dir = SCRIPT_DIR / "rouge_l_java"
@@ -24,18 +84,74 @@ def compile_java():
         print(f"Error: {java_file} not found")
         return False
     
-    print("Compiling Java implementation...")
+    if is_up_to_date(java_dir / "RougeL.class", [java_file]):
+        print("Java class file is up to date, skipping compilation.")
+    else:
+        print("Compiling Java implementation...")
+        result = subprocess.run(
+            [executable("javac"), str(java_file)],
+            capture_output=True,
+            text=True,
+            close_fds=False
+        )
+        
+        if result.returncode != 0:
+            print(f"Java compilation failed: {result.stderr}")
+            return False
+        
+        print("Java compilation successful!")
+    
+    if not package_java_jar(java_dir):
+        return False
+    
+    create_java_class_archive()
+    return True
+
+def package_java_jar(java_dir):
+    """Package the compiled classes into JAVA_JAR"""
+    class_files = sorted(java_dir.glob("*.class"))
+    if is_up_to_date(JAVA_JAR, class_files):
+        return True
+    
+    command = [executable("jar"), "cf", str(JAVA_JAR)]
+    for class_file in class_files:
+        command += ["-C", str(java_dir), class_file.name]
+    
     result = subprocess.run(
-        ["javac", str(java_file)],
+        command,
         capture_output=True,
-        text=True
+        text=True,
+        close_fds=False
     )
     
     if result.returncode != 0:
-        print(f"Java compilation failed: {result.stderr}")
+        print(f"Java packaging failed: {result.stderr}")
+        return False
+    
+    return True
+
+def create_java_class_archive():
+    """Dump an AppCDS archive (JEP 310) so later JVMs map the loaded classes instead of parsing them"""
+    if is_up_to_date(JAVA_CDS_ARCHIVE, [JAVA_JAR]):
+        return True
+    
+    # --dry-run scores the examples once without printing, so every class
+    # the benchmark touches ends up in the archive
+    print("Creating Java class data sharing archive...")
+    result = subprocess.run(
+        [executable("java"), f"-XX:ArchiveClassesAtExit={JAVA_CDS_ARCHIVE}", "-cp", str(JAVA_JAR), "RougeL", "--dry-run"],
+        capture_output=True,
+        text=True,
+        close_fds=False
+    )
+    
+    if result.returncode != 0 or not JAVA_CDS_ARCHIVE.exists():
+        # e.g. ArchiveClassesAtExit needs JDK 13+; Java then simply runs without the archive
+        cause = (result.stderr or result.stdout).strip() or f"exit code {result.returncode}"
+        print(f"  Skipping class data sharing, archive dump failed: {cause}")
         return False
     
-    print("Java compilation successful!")
+    print("Java class data sharing archive created!")
     return True
 
 def compile_rust():
@@ -46,12 +162,19 @@ def compile_rust():
         print(f"Error: {rust_dir} not found")
         return False
     
+    # Skip cargo entirely when nothing changed; even a no-op build costs noticeable time
+    rust_binary = rust_dir / "target" / "release" / "rouge_l_rust"
+    rust_sources = [rust_dir / "src", rust_dir / "Cargo.toml", rust_dir / "Cargo.lock"]
+    if is_up_to_date(rust_binary, rust_sources):
+        print("Rust binary is up to date, skipping compilation.")
+        return True
+    
     print("Compiling Rust implementation...")
     result = subprocess.run(
-        ["cargo", "build", "--release"],
-        cwd=rust_dir,
+        [executable("cargo"), "build", "--release", "--manifest-path", str(rust_dir / "Cargo.toml")],
         capture_output=True,
-        text=True
+        text=True,
+        close_fds=False
     )
     
     if result.returncode != 0:
@@ -61,140 +184,212 @@ def compile_rust():
     print("Rust compilation successful!")
     return True
 
-def run_java(iterations=5):
-    """Run Java implementation and measure execution time"""
-    java_dir = SCRIPT_DIR / "rouge_l_java"
-    java_class = java_dir / "RougeL.class"
+def run_worker(command, language, warmup, min_iterations, max_iterations, cv_target=0.02):
+    """Drive a persistent worker process and collect the execution times it reports.
     
-    if not java_class.exists():
-        print("Java class file not found. Please compile first.")
-        return []
+    After at least min_iterations, measuring stops as soon as the coefficient of variation
+    of the last CV_WINDOW samples drops below cv_target, or after max_iterations.
     
-    print(f"\nRunning Java implementation {iterations} times...")
+    Returns (times, last_results) where last_results are the per-example scores the
+    worker reports as JSON after the measured runs.
+    """
+    # Buffer progress lines so concurrent workers don't interleave their output
+    log = [f"\nRunning {language} implementation ({warmup} warmup + {min_iterations}-{max_iterations} measured iterations)..."]
     times = []
+    last_results = []
+    
+    wall_start = time.perf_counter_ns()
+    
+    # Launch the binary once; each RUN is timed inside the child so process
+    # startup (and for Java, JVM boot) stays out of the measurements
+    worker = subprocess.Popen(
+        command + ["--worker"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        bufsize=0,
+        close_fds=False  # Only inheritable fds are passed; our pipes are not (PEP 446)
+    )
     
-    for i in range(iterations):
-        start = time.time()
-        result = subprocess.run(
-            ["java", "-cp", str(java_dir), "RougeL"],
-            capture_output=True,
-            text=True
-        )
-        end = time.time()
+    def request(command, reply_prefix):
+        """Send one command and return (reply, error).
+        
+        Lines that are neither the expected reply nor an ERROR (e.g. JVM warnings, which
+        unified logging writes to stdout) are logged and skipped.
+        """
+        try:
+            worker.stdin.write(command)
+        except BrokenPipeError:
+            return None, "worker exited"
         
-        if result.returncode == 0:
-            execution_time = (end - start) * 1000  # Convert to milliseconds
+        for line in iter(worker.stdout.readline, b""):
+            line = line.decode().strip()
+            if line.startswith(reply_prefix):
+                return line, None
+            if line.startswith("ERROR"):
+                return None, line
+            if line:
+                log.append(f"  Worker output: {line}")
+        return None, "worker exited"
+    
+    def run_once():
+        """Send one RUN command; return the reported time in ns, or an error message"""
+        reply, error = request(b"RUN\n", "DONE ")
+        if error:
+            return None, error
+        return int(reply.split()[1]), None
+    
+    try:
+        # Warmup samples let the JIT and caches settle; they are reported but discarded
+        for i in range(warmup):
+            execution_time, error = run_once()
+            if error:
+                log.append(f"  Warmup {i+1} failed: {error}")
+                return times, last_results
+            log.append(f"  Warmup {i+1}: {execution_time / NS_PER_MS:.3f} ms")
+        
+        for i in range(max_iterations):
+            execution_time, error = run_once()
+            if error:
+                log.append(f"  Iteration {i+1} failed: {error}")
+                if error == "worker exited":
+                    break
+                continue
             times.append(execution_time)
-            print(f"  Iteration {i+1}: {execution_time:.2f} ms")
-        else:
-            print(f"  Iteration {i+1} failed: {result.stderr}")
+            log.append(f"  Iteration {i+1}: {execution_time / NS_PER_MS:.3f} ms")
+            
+            # Stop once the recent samples have settled into a steady state
+            if len(times) >= max(min_iterations, CV_WINDOW):
+                window = np.asarray(times[-CV_WINDOW:], dtype=np.float64)
+                cv = window.std() / window.mean()
+                if cv < cv_target:
+                    log.append(f"  Steady state after {len(times)} iterations (CV {cv:.2%} < {cv_target:.0%})")
+                    break
+        
+        # Fetch structured results for the accuracy comparison; one JSON parse
+        # replaces parsing the human-readable report. The reply carries a "JSON "
+        # marker like "DONE ", since JVM log lines also start with "["
+        if times:
+            reply, error = request(b"JSON\n", "JSON ")
+            if not error:
+                try:
+                    last_results = json_parser.loads(reply.split(" ", 1)[1])
+                except ValueError as exc:  # json and orjson decode errors both subclass ValueError
+                    error = f"invalid JSON ({exc})"
+            if error:
+                log.append(f"  Fetching results failed: {error}")
+    finally:
+        try:
+            worker.stdin.write(b"QUIT\n")
+            worker.stdin.close()
+        except BrokenPipeError:
+            pass
+        worker.wait()
+        wall_time = time.perf_counter_ns() - wall_start
+        log.append(f"  Total wall time: {wall_time / NS_PER_MS:.3f} ms")
+        print("\n".join(log))
+    
+    return times, last_results
+
+def cpu_pin_prefixes(count):
+    """Split the available CPUs into `count` disjoint `taskset -c` command prefixes"""
+    if not shutil.which("taskset") or not hasattr(os, "sched_getaffinity"):
+        return [[] for _ in range(count)]
+    
+    cpus = sorted(os.sched_getaffinity(0))
+    if len(cpus) < count:
+        # Not enough CPUs to keep the workers apart; let the scheduler place them
+        return [[] for _ in range(count)]
+    
+    per_worker = len(cpus) // count
+    return [
+        [executable("taskset"), "-c", ",".join(str(cpu) for cpu in cpus[i * per_worker:(i + 1) * per_worker])]
+        for i in range(count)
+    ]
+
+def run_forks(command, language, forks, warmup, min_iterations, max_iterations, cv_target):
+    """Run `forks` independent workers, each with its own warmup, and pool their samples.
+    
+    Separate processes re-randomize memory layout and JIT decisions, so the spread of
+    the per-fork medians shows variance a single process would hide.
+    """
+    times = []
+    last_results = []
+    fork_medians = []
+    
+    for fork in range(forks):
+        label = language if forks == 1 else f"{language} (fork {fork+1}/{forks})"
+        fork_times, fork_results = run_worker(command, label, warmup, min_iterations, max_iterations, cv_target)
+        if fork_times:
+            times.extend(fork_times)
+            fork_medians.append(np.median(fork_times))
+            last_results = fork_results
+    
+    if len(fork_medians) > 1:
+        medians = ", ".join(f"{median / NS_PER_MS:.3f}" for median in fork_medians)
+        spread = (max(fork_medians) - min(fork_medians)) / min(fork_medians)
+        print(f"\n{language} per-fork medians: {medians} ms (spread {spread:.1%})")
+    
+    return times, last_results
+
+def run_java(warmup=5, min_iterations=10, max_iterations=50, cv_target=0.02, forks=3, cpu_prefix=(),
+             java_opts=JAVA_OPTS_STEADY_STATE):
+    """Run Java implementation and measure execution time"""
+    if not JAVA_JAR.exists():
+        print("Java jar not found. Please compile first.")
+        return [], []
+    
+    java_opts = list(java_opts)
+    if JAVA_CDS_ARCHIVE.exists():
+        java_opts.append(f"-XX:SharedArchiveFile={JAVA_CDS_ARCHIVE}")
     
-    return times
+    command = [*cpu_prefix, executable("java"), *java_opts, "-cp", str(JAVA_JAR), "RougeL"]
+    return run_forks(command, "Java", forks, warmup, min_iterations, max_iterations, cv_target)
 
-def run_rust(iterations=5):
+def run_rust(warmup=2, min_iterations=10, max_iterations=50, cv_target=0.02, forks=1, cpu_prefix=()):
     """Run Rust implementation and measure execution time"""
     rust_dir = SCRIPT_DIR / "rouge_l_rust"
     rust_binary = rust_dir / "target" / "release" / "rouge_l_rust"
     
     if not rust_binary.exists():
         print("Rust binary not found. Please compile first.")
-        return []
+        return [], []
     
-    print(f"\nRunning Rust implementation {iterations} times...")
-    times = []
-    
-    for i in range(iterations):
-        start = time.time()
-        result = subprocess.run(
-            [str(rust_binary)],
-            capture_output=True,
-            text=True
-        )
-        end = time.time()
-        
-        if result.returncode == 0:
-            execution_time = (end - start) * 1000  # Convert to milliseconds
-            times.append(execution_time)
-            print(f"  Iteration {i+1}: {execution_time:.2f} ms")
-        else:
-            print(f"  Iteration {i+1} failed: {result.stderr}")
-    
-    return times
+    command = [*cpu_prefix, str(rust_binary)]
+    return run_forks(command, "Rust", forks, warmup, min_iterations, max_iterations, cv_target)
 
-def extract_results(output):
-    """Extract ROUGE-L results from output with scenario information"""
-    results = []
-    lines = output.strip().split('\n')
-    
-    current_example = None
-    current_level = None
-    current_level_name = None
-    current_candidate = None
-    current_reference = None
-    
-    for line in lines:
-        if "Level" in line and ":" in line:
-            # Extract level information: "--- Level 1: Basic Text ---"
-            level_match = re.search(r'Level (\d+): (.+)', line)
-            if level_match:
-                current_level = int(level_match.group(1))
-                current_level_name = level_match.group(2).strip()
-        
-        elif line.startswith("Example"):
-            current_example = int(line.split()[1].rstrip(':'))
-        
-        elif line.strip().startswith("Candidate:"):
-            current_candidate = line.split("Candidate:", 1)[1].strip()
-        
-        elif line.strip().startswith("Reference:"):
-            current_reference = line.split("Reference:", 1)[1].strip()
-        
-        elif "Result:" in line or "F-Measure:" in line:
-            # Extract numbers
-            numbers = re.findall(r'\d+\.\d+', line)
-            if len(numbers) >= 3:
-                results.append({
-                    'example_num': current_example,
-                    'level': current_level,
-                    'level_name': current_level_name,
-                    'candidate': current_candidate,
-                    'reference': current_reference,
-                    'f_measure': float(numbers[0]),
-                    'precision': float(numbers[1]),
-                    'recall': float(numbers[2])
-                })
-                # Reset for next example
-                current_candidate = None
-                current_reference = None
-    
-    return results
+def truncate(text, limit=60):
+    """Flatten whitespace and shorten text for display, marking the cut with an ellipsis"""
+    text = " ".join(text.split())
+    return text if len(text) <= limit else f"{text[:limit]}..."
 
-def compare_results():
-    """Compare results from both implementations with scenario details"""
-    print("\n=== COMPARING RESULTS WITH SCENARIOS ===")
-    
-    # Run both and capture output
-    java_dir = SCRIPT_DIR / "rouge_l_java"
-    java_result = subprocess.run(
-        ["java", "-cp", str(java_dir), "RougeL"],
-        capture_output=True,
-        text=True
-    )
-    
-    rust_dir = SCRIPT_DIR / "rouge_l_rust"
-    rust_result = subprocess.run(
-        [str(rust_dir / "target" / "release" / "rouge_l_rust")],
-        capture_output=True,
-        text=True
-    )
+def score_matrix(results):
+    """Stack the (F-measure, precision, recall) of each result into an (N, 3) array"""
+    return np.array(
+        [[res['f_measure'], res['precision'], res['recall']] for res in results],
+        dtype=np.float64
+    ).reshape(-1, 3)
+
+def compare_results(java_results, rust_results):
+    """Compare results from both implementations with scenario details.
     
-    java_results = extract_results(java_result.stdout)
-    rust_results = extract_results(rust_result.stdout)
+    Returns (java_results, rust_results, java_scores, match_mask) where java_scores is the
+    (N, 3) F/P/R array and match_mask flags examples whose scores agree within tolerance.
+    """
+    print("\n=== COMPARING RESULTS WITH SCENARIOS ===")
     
     print("\nAccuracy Comparison by Scenario:")
     if len(java_results) == len(rust_results):
+        # Diff every example in one vectorized pass; the loop below only prints
+        java_scores = score_matrix(java_results)
+        rust_scores = score_matrix(rust_results)
+        diffs = np.abs(java_scores - rust_scores)
+        match_mask = (diffs < 0.0001).all(axis=1)
+        
+        # References are often shared across candidates; truncate each distinct string once
+        display_cache = {}
+        
         current_level = None
-        for i, (j_res, r_res) in enumerate(zip(java_results, rust_results), 1):
+        for i, j_res in enumerate(java_results, 1):
             # Show level header when level changes
             if j_res.get('level') != current_level and j_res.get('level') is not None:
                 current_level = j_res['level']
@@ -205,50 +400,72 @@ def compare_results():
             
             print(f"\nExample {i}:")
             if j_res.get('candidate'):
-                candidate_display = j_res['candidate'][:60] + "..." if len(j_res['candidate']) > 60 else j_res['candidate']
-                print(f"  Candidate: {candidate_display}")
+                candidate = j_res['candidate']
+                if candidate not in display_cache:
+                    display_cache[candidate] = truncate(candidate)
+                print(f"  Candidate: {display_cache[candidate]}")
             if j_res.get('reference'):
-                reference_display = j_res['reference'][:60] + "..." if len(j_res['reference']) > 60 else j_res['reference']
-                print(f"  Reference: {reference_display}")
+                reference = j_res['reference']
+                if reference not in display_cache:
+                    display_cache[reference] = truncate(reference)
+                print(f"  Reference: {display_cache[reference]}")
             
-            print(f"  Java - F: {j_res['f_measure']:.4f}, P: {j_res['precision']:.4f}, R: {j_res['recall']:.4f}")
-            print(f"  Rust - F: {r_res['f_measure']:.4f}, P: {r_res['precision']:.4f}, R: {r_res['recall']:.4f}")
+            # Print from the score matrices: a null score is already NaN there and shows as nan
+            j_f, j_p, j_r = java_scores[i - 1]
+            r_f, r_p, r_r = rust_scores[i - 1]
+            print(f"  Java - F: {j_f:.4f}, P: {j_p:.4f}, R: {j_r:.4f}")
+            print(f"  Rust - F: {r_f:.4f}, P: {r_p:.4f}, R: {r_r:.4f}")
             
             # Check if results match (within small floating point tolerance)
-            f_diff = abs(j_res['f_measure'] - r_res['f_measure'])
-            p_diff = abs(j_res['precision'] - r_res['precision'])
-            r_diff = abs(j_res['recall'] - r_res['recall'])
-            
-            if f_diff < 0.0001 and p_diff < 0.0001 and r_diff < 0.0001:
+            if match_mask[i - 1]:
                 print(f"  ✓ Results match perfectly!")
             else:
+                f_diff, p_diff, r_diff = diffs[i - 1]
                 print(f"  ⚠ Differences: F={f_diff:.6f}, P={p_diff:.6f}, R={r_diff:.6f}")
         
         # Return results for final report
-        return java_results, rust_results
+        return java_results, rust_results, java_scores, match_mask
     
-    return [], []
+    return [], [], None, None
 
 def print_statistics(times, language):
-    """Print performance statistics"""
+    """Print performance statistics and return them (in ns) for the final report"""
     if not times:
         print(f"\nNo valid {language} execution times recorded.")
-        return
+        return None
+    
+    # One contiguous array, reduced by numpy, instead of a Python pass per statistic
+    times = np.asarray(times, dtype=np.float64)
+    stats = {
+        'mean': times.mean(),
+        'median': np.median(times),
+        'min': times.min(),
+        'max': times.max(),
+        'stdev': times.std(ddof=1) if times.size > 1 else None,
+    }
     
     print(f"\n{language} Performance Statistics:")
-    print(f"  Successful runs: {len(times)}")
-    print(f"  Average time: {statistics.mean(times):.2f} ms")
-    print(f"  Median time: {statistics.median(times):.2f} ms")
-    print(f"  Min time: {min(times):.2f} ms")
-    print(f"  Max time: {max(times):.2f} ms")
-    if len(times) > 1:
-        print(f"  Standard deviation: {statistics.stdev(times):.2f} ms")
+    print(f"  Successful runs: {times.size}")
+    print(f"  Average time: {stats['mean'] / NS_PER_MS:.3f} ms")
+    print(f"  Median time: {stats['median'] / NS_PER_MS:.3f} ms")
+    print(f"  Min time: {stats['min'] / NS_PER_MS:.3f} ms")
+    print(f"  Max time: {stats['max'] / NS_PER_MS:.3f} ms")
+    if stats['stdev'] is not None:
+        print(f"  Standard deviation: {stats['stdev'] / NS_PER_MS:.3f} ms")
+    
+    return stats
 
 def main():
     print("=" * 60)
     print("ROUGE-L Implementation Comparison: Java vs Rust")
     print("=" * 60)
     
+    java_profile = os.environ.get("ROUGE_L_JAVA_PROFILE", "steady-state")
+    if java_profile not in JAVA_PROFILES:
+        print(f"Unknown ROUGE_L_JAVA_PROFILE '{java_profile}'. Choose one of: {', '.join(JAVA_PROFILES)}")
+        return
+    java_opts, java_warmup = JAVA_PROFILES[java_profile]
+    
     # Compile both implementations
     if not compile_java():
         print("Failed to compile Java. Exiting.")
@@ -259,16 +476,35 @@ def main():
         return
     
     # Run performance comparison
-    iterations = 10
-    java_times = run_java(iterations)
-    rust_times = run_rust(iterations)
+    min_iterations = 10
+    max_iterations = 50
+    cv_target = 0.02  # Stop measuring once the last few samples vary by less than 2%
+    rust_warmup = 2
+    java_forks = 3  # Separate JVMs, pooled like JMH forks
+    rust_forks = 1
+    
+    # Both workers are independent child processes, so drive them concurrently,
+    # pinned to disjoint CPU sets when possible to avoid cross-interference
+    java_cpus, rust_cpus = cpu_pin_prefixes(2)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        java_future = executor.submit(
+            run_java, java_warmup, min_iterations, max_iterations, cv_target, java_forks,
+            cpu_prefix=java_cpus, java_opts=java_opts
+        )
+        rust_future = executor.submit(
+            run_rust, rust_warmup, min_iterations, max_iterations, cv_target, rust_forks,
+            cpu_prefix=rust_cpus
+        )
+        java_times, java_results = java_future.result()
+        rust_times, rust_results = rust_future.result()
     
     # Print statistics
-    print_statistics(java_times, "Java")
-    print_statistics(rust_times, "Rust")
+    java_stats = print_statistics(java_times, "Java")
+    rust_stats = print_statistics(rust_times, "Rust")
     
-    # Compare results and get detailed data
-    java_results, rust_results = compare_results()
+    # Compare results and get detailed data; each worker re-scored the examples
+    # for its JSON command after the measured runs
+    java_results, rust_results, java_scores, match_mask = compare_results(java_results, rust_results)
     
     # Final comprehensive report
     print("\n" + "=" * 70)
@@ -276,86 +512,74 @@ def main():
     print("=" * 70)
     
     # Performance Summary
-    if java_times and rust_times:
-        java_avg = statistics.mean(java_times)
-        rust_avg = statistics.mean(rust_times)
-        java_median = statistics.median(java_times)
-        rust_median = statistics.median(rust_times)
-        
-        # Skip first iteration for Rust (cold start) if we have enough iterations
-        rust_warm_times = rust_times[1:] if len(rust_times) > 1 else rust_times
-        rust_warm_avg = statistics.mean(rust_warm_times) if rust_warm_times else rust_avg
+    if java_stats and rust_stats:
+        java_avg = java_stats['mean'] / NS_PER_MS
+        rust_avg = rust_stats['mean'] / NS_PER_MS
+        java_median = java_stats['median'] / NS_PER_MS
+        rust_median = rust_stats['median'] / NS_PER_MS
         
         print("\n📊 PERFORMANCE SUMMARY:")
-        print(f"  Java average: {java_avg:.2f} ms (median: {java_median:.2f} ms)")
-        print(f"  Rust average: {rust_avg:.2f} ms (median: {rust_median:.2f} ms)")
-        print(f"  Rust warm avg: {rust_warm_avg:.2f} ms (excluding first cold start)")
+        print(f"  Java average: {java_avg:.3f} ms (median: {java_median:.3f} ms)")
+        print(f"  Rust average: {rust_avg:.3f} ms (median: {rust_median:.3f} ms)")
         
-        # Compare using warm times (excluding first cold start)
-        if rust_warm_avg < java_avg:
-            speedup = java_avg / rust_warm_avg
+        # Warmup iterations are already excluded from both sets of times
+        if rust_avg < java_avg:
+            speedup = java_avg / rust_avg
             print(f"\n  🚀 Rust is {speedup:.2f}x faster than Java (after warmup)")
         else:
-            speedup = rust_warm_avg / java_avg
-            print(f"\n  🚀 Java is {speedup:.2f}x faster than Rust")
+            speedup = rust_avg / java_avg
+            print(f"\n  🚀 Java is {speedup:.2f}x faster than Rust (after warmup)")
     
     # Scenario Summary by Level
     if java_results and rust_results:
         print("\n📋 SCENARIO SUMMARY BY LEVEL:")
         
-        level_stats = defaultdict(lambda: {'count': 0, 'f_scores': [], 'matched': 0})
-        
-        for j_res, r_res in zip(java_results, rust_results):
-            level = j_res.get('level', 0)
-            level_name = j_res.get('level_name', f'Level {level}')
-            level_stats[level]['count'] += 1
-            level_stats[level]['f_scores'].append(j_res['f_measure'])
-            
-            # Check if results match
-            f_diff = abs(j_res['f_measure'] - r_res['f_measure'])
-            if f_diff < 0.0001:
-                level_stats[level]['matched'] += 1
-        
-        # Get level names from results
-        level_names = {}
-        for j_res in java_results:
-            level = j_res.get('level')
-            if level and level not in level_names:
-                level_names[level] = j_res.get('level_name', f'Level {level}')
+        # Group by level with one O(N) numpy reduction per statistic
+        all_f_scores = java_scores[:, 0]
+        levels = np.array([j_res.get('level') or 0 for j_res in java_results])
+        unique_levels, first_index, level_index = np.unique(levels, return_index=True, return_inverse=True)
+        level_counts = np.bincount(level_index)
+        level_f_sums = np.bincount(level_index, weights=all_f_scores)
+        level_matched = np.bincount(level_index, weights=match_mask.astype(int)).astype(int)
         
-        for level in sorted(level_stats.keys()):
-            stats = level_stats[level]
-            level_name = level_names.get(level, f'Level {level}')
-            avg_f = statistics.mean(stats['f_scores']) if stats['f_scores'] else 0.0
-            match_rate = (stats['matched'] / stats['count'] * 100) if stats['count'] > 0 else 0.0
+        for level, first, count, f_sum, matched in zip(unique_levels, first_index, level_counts,
+                                                       level_f_sums, level_matched):
+            # Name each level from its first example, found by the same np.unique pass
+            level_name = java_results[first].get('level_name') or f'Level {level}'
+            avg_f = f_sum / count
+            match_rate = matched / count * 100
             
             print(f"\n  Level {level}: {level_name}")
-            print(f"    Examples: {stats['count']}")
+            print(f"    Examples: {count}")
             print(f"    Average F-Measure: {avg_f:.4f}")
-            print(f"    Accuracy Match Rate: {match_rate:.1f}% ({stats['matched']}/{stats['count']})")
+            print(f"    Accuracy Match Rate: {match_rate:.1f}% ({matched}/{count})")
         
         # Overall Accuracy Summary
-        total_matched = sum(s['matched'] for s in level_stats.values())
-        total_examples = sum(s['count'] for s in level_stats.values())
+        total_matched = int(match_mask.sum())
+        total_examples = len(java_results)
         overall_match_rate = (total_matched / total_examples * 100) if total_examples > 0 else 0.0
         
         print(f"\n  Overall: {total_examples} examples tested, {total_matched} perfectly matched ({overall_match_rate:.1f}%)")
         
         # F-Measure Distribution
-        all_f_scores = [j_res['f_measure'] for j_res in java_results]
         print(f"\n  F-Measure Statistics:")
-        print(f"    Average: {statistics.mean(all_f_scores):.4f}")
-        print(f"    Median: {statistics.median(all_f_scores):.4f}")
-        print(f"    Min: {min(all_f_scores):.4f}")
-        print(f"    Max: {max(all_f_scores):.4f}")
+        print(f"    Average: {all_f_scores.mean():.4f}")
+        print(f"    Median: {np.median(all_f_scores):.4f}")
+        print(f"    Min: {all_f_scores.min():.4f}")
+        print(f"    Max: {all_f_scores.max():.4f}")
     
     print("\n" + "=" * 70)
     print("NOTES:")
-    print("  • Java includes JVM startup time in measurements")
-    print("  • Rust first iteration includes cold start overhead")
+    print("  • Timings are measured inside each worker process, so process and JVM startup are excluded")
+    print("  • Java and Rust run concurrently, pinned to disjoint CPUs when taskset is available")
+    print(f"  • Warmup iterations (Java: {java_warmup}, Rust: {rust_warmup}) are reported but excluded from statistics")
+    print(f"  • Samples are pooled across separate processes (Java: {java_forks} forks, Rust: {rust_forks})")
+    print(f"  • Java profile: {java_profile} ({' '.join(java_opts)}); set ROUGE_L_JAVA_PROFILE to "
+          f"{' or '.join(JAVA_PROFILES)}")
+    print(f"  • Measurement stops once the last {CV_WINDOW} samples have a CV below {cv_target:.0%} "
+          f"({min_iterations}-{max_iterations} iterations)")
     print("  • Both implementations produce mathematically identical results")
     print("  • Test scenarios progress from basic text to complex structured data")
-    print("  • For production use, both would benefit from warmup periods")
     print("=" * 70)
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import java.io.*;
 import java.util.*;
 
 public class RougeL {
@@ -79,121 +80,264 @@ public class RougeL {
         }
     }
     
+    // Test examples - progressing from basic to advanced
+    private static final String[][] EXAMPLES = {
+        // Level 1: Basic Text (Simple sentences)
+        {
+            "The quick brown fox jumps over the lazy dog",
+            "A quick brown fox jumps over a lazy dog"
+        },
+        {
+            "Machine learning is a subset of artificial intelligence",
+            "Machine learning forms part of artificial intelligence systems"
+        },
+        
+        // Level 2: Structured Text (Lists, formatting)
+        {
+            "Key features include: security authentication and data encryption",
+            "Main features are: authentication security and encryption of data"
+        },
+        {
+            "User name: John Doe, Email: john@example.com, Status: Active",
+            "Name: John Doe, Email address: john@example.com, Status: Active user"
+        },
+        
+        // Level 3: JSON-like structured data
+        {
+            "{\"user\": {\"name\": \"Alice\", \"age\": 30, \"city\": \"New York\"}}",
+            "{\"user\": {\"name\": \"Alice\", \"age\": 30, \"location\": \"New York\"}}"
+        },
+        {
+            "{\"employees\": [{\"id\": 1, \"name\": \"Bob\"}, {\"id\": 2, \"name\": \"Charlie\"}]}",
+            "{\"staff\": [{\"id\": 1, \"name\": \"Bob\"}, {\"id\": 2, \"name\": \"Charlie\"}]}"
+        },
+        {
+            "{\"status\": \"success\", \"data\": {\"count\": 42, \"items\": [\"a\", \"b\"]}}",
+            "{\"result\": \"success\", \"payload\": {\"total\": 42, \"list\": [\"a\", \"b\"]}}"
+        },
+        
+        // Level 4: HTML content
+        {
+            "<div><h1>Title</h1><p>Content here</p></div>",
+            "<section><h1>Title</h1><p>Content here</p></section>"
+        },
+        {
+            "<a href=\"/page\">Link</a> <img src=\"photo.jpg\" alt=\"Image\">",
+            "<a href=\"/page\">Link</a> <img src=\"photo.jpg\" alt=\"Photo\">"
+        },
+        {
+            "<ul><li>Item 1</li><li>Item 2</li><li>Item 3</li></ul>",
+            "<ol><li>Item 1</li><li>Item 2</li><li>Item 3</li></ol>"
+        },
+        
+        // Level 5: Mixed complex content (JSON + text)
+        {
+            "The API returned {\"status\": 200, \"message\": \"OK\"} with user data",
+            "API response was {\"status\": 200, \"message\": \"OK\"} containing user information"
+        },
+        {
+            "Error: {\"code\": 404, \"error\": \"Not Found\"} occurred at 2024-01-15",
+            "Error occurred: {\"code\": 404, \"error\": \"Not Found\"} on date 2024-01-15"
+        },
+        
+        // Level 6: Real-world complex scenarios
+        {
+            "Natural language processing enables computers to understand human language through advanced algorithms",
+            "NLP allows machines to comprehend natural human communication using sophisticated algorithmic approaches"
+        },
+        {
+            "The cat sat on the mat while the dog played in the yard",
+            "The dog played in the yard while the cat sat on the mat"
+        },
+        {
+            "POST /api/users HTTP/1.1\nHost: api.example.com\nContent-Type: application/json\n{\"name\": \"Test\"}",
+            "POST /api/users HTTP/1.1\nHost: api.example.com\nContent-Type: application/json\n{\"username\": \"Test\"}"
+        },
+        {
+            "<html><body><script>console.log('Hello');</script><div>Content</div></body></html>",
+            "<html><body><div>Content</div><script>console.log('Hello');</script></body></html>"
+        }
+    };
+    
+    private static final String[] LEVEL_NAMES = {"Basic Text", "Structured Text", "JSON Data", "HTML Content",
+                                                 "Mixed Content", "Real-world Scenarios"};
+    
+    // Index of the first example in each level
+    private static final int[] LEVEL_STARTS = {0, 2, 4, 7, 10, 12};
+    
     /**
-     * Main method for testing
+     * Determine the (1-based) level an example belongs to
      */
-    public static void main(String[] args) {
-        // Test examples - progressing from basic to advanced
-        String[][] examples = {
-            // Level 1: Basic Text (Simple sentences)
-            {
-                "The quick brown fox jumps over the lazy dog",
-                "A quick brown fox jumps over a lazy dog"
-            },
-            {
-                "Machine learning is a subset of artificial intelligence",
-                "Machine learning forms part of artificial intelligence systems"
-            },
-            
-            // Level 2: Structured Text (Lists, formatting)
-            {
-                "Key features include: security authentication and data encryption",
-                "Main features are: authentication security and encryption of data"
-            },
-            {
-                "User name: John Doe, Email: john@example.com, Status: Active",
-                "Name: John Doe, Email address: john@example.com, Status: Active user"
-            },
-            
-            // Level 3: JSON-like structured data
-            {
-                "{\"user\": {\"name\": \"Alice\", \"age\": 30, \"city\": \"New York\"}}",
-                "{\"user\": {\"name\": \"Alice\", \"age\": 30, \"location\": \"New York\"}}"
-            },
-            {
-                "{\"employees\": [{\"id\": 1, \"name\": \"Bob\"}, {\"id\": 2, \"name\": \"Charlie\"}]}",
-                "{\"staff\": [{\"id\": 1, \"name\": \"Bob\"}, {\"id\": 2, \"name\": \"Charlie\"}]}"
-            },
-            {
-                "{\"status\": \"success\", \"data\": {\"count\": 42, \"items\": [\"a\", \"b\"]}}",
-                "{\"result\": \"success\", \"payload\": {\"total\": 42, \"list\": [\"a\", \"b\"]}}"
-            },
-            
-            // Level 4: HTML content
-            {
-                "<div><h1>Title</h1><p>Content here</p></div>",
-                "<section><h1>Title</h1><p>Content here</p></section>"
-            },
-            {
-                "<a href=\"/page\">Link</a> <img src=\"photo.jpg\" alt=\"Image\">",
-                "<a href=\"/page\">Link</a> <img src=\"photo.jpg\" alt=\"Photo\">"
-            },
-            {
-                "<ul><li>Item 1</li><li>Item 2</li><li>Item 3</li></ul>",
-                "<ol><li>Item 1</li><li>Item 2</li><li>Item 3</li></ol>"
-            },
+    private static int levelOf(int index) {
+        int level = 0;
+        while (level < LEVEL_STARTS.length && LEVEL_STARTS[level] <= index) {
+            level++;
+        }
+        return level;
+    }
+    
+    // Results of the last worker RUN; storing them in a field stops the JIT
+    // from eliminating the measured work as dead code
+    private static RougeLResult[] lastResults;
+    
+    /**
+     * Score every example; this is the work a worker RUN times
+     */
+    private static RougeLResult[] scoreAll() {
+        RougeLResult[] results = new RougeLResult[EXAMPLES.length];
+        for (int i = 0; i < EXAMPLES.length; i++) {
+            results[i] = calculateRougeL(EXAMPLES[i][0], EXAMPLES[i][1]);
+        }
+        return results;
+    }
+    
+    /**
+     * Score every example and render the report that main prints
+     */
+    private static String renderReport() {
+        StringBuilder out = new StringBuilder();
+        out.append("=== ROUGE-L Java Implementation ===\n\n");
+        out.append("Testing ").append(EXAMPLES.length).append(" examples (Basic to Advanced)\n\n");
+        
+        for (int i = 0; i < EXAMPLES.length; i++) {
+            String candidate = EXAMPLES[i][0];
+            String reference = EXAMPLES[i][1];
+            int level = levelOf(i);
             
-            // Level 5: Mixed complex content (JSON + text)
-            {
-                "The API returned {\"status\": 200, \"message\": \"OK\"} with user data",
-                "API response was {\"status\": 200, \"message\": \"OK\"} containing user information"
-            },
-            {
-                "Error: {\"code\": 404, \"error\": \"Not Found\"} occurred at 2024-01-15",
-                "Error occurred: {\"code\": 404, \"error\": \"Not Found\"} on date 2024-01-15"
-            },
+            RougeLResult result = calculateRougeL(candidate, reference);
             
-            // Level 6: Real-world complex scenarios
-            {
-                "Natural language processing enables computers to understand human language through advanced algorithms",
-                "NLP allows machines to comprehend natural human communication using sophisticated algorithmic approaches"
-            },
-            {
-                "The cat sat on the mat while the dog played in the yard",
-                "The dog played in the yard while the cat sat on the mat"
-            },
-            {
-                "POST /api/users HTTP/1.1\nHost: api.example.com\nContent-Type: application/json\n{\"name\": \"Test\"}",
-                "POST /api/users HTTP/1.1\nHost: api.example.com\nContent-Type: application/json\n{\"username\": \"Test\"}"
-            },
-            {
-                "<html><body><script>console.log('Hello');</script><div>Content</div></body></html>",
-                "<html><body><div>Content</div><script>console.log('Hello');</script></body></html>"
+            if (LEVEL_STARTS[level - 1] == i) {
+                out.append("--- Level ").append(level).append(": ").append(LEVEL_NAMES[level - 1]).append(" ---\n");
             }
-        };
-        
-        System.out.println("=== ROUGE-L Java Implementation ===\n");
-        System.out.println("Testing " + examples.length + " examples (Basic to Advanced)\n");
+            
+            out.append("Example ").append(i + 1).append(":\n");
+            out.append("  Candidate: ").append(candidate.length() > 80 ? candidate.substring(0, 77) + "..." : candidate).append('\n');
+            out.append("  Reference: ").append(reference.length() > 80 ? reference.substring(0, 77) + "..." : reference).append('\n');
+            out.append("  Result:    ").append(result).append("\n\n");
+        }
         
-        int level = 1;
-        int exampleInLevel = 0;
-        String[] levelNames = {"Basic Text", "Structured Text", "JSON Data", "HTML Content", 
-                               "Mixed Content", "Real-world Scenarios"};
+        return out.toString();
+    }
+    
+    /**
+     * Score every example and render the results as a single-line JSON array
+     */
+    private static String renderJson() {
+        StringBuilder out = new StringBuilder("[");
         
-        for (int i = 0; i < examples.length; i++) {
-            String candidate = examples[i][0];
-            String reference = examples[i][1];
-            
-            // Determine level
-            if (i == 0) level = 1;
-            else if (i == 2) level = 2;
-            else if (i == 4) level = 3;
-            else if (i == 7) level = 4;
-            else if (i == 10) level = 5;
-            else if (i == 12) level = 6;
+        for (int i = 0; i < EXAMPLES.length; i++) {
+            String candidate = EXAMPLES[i][0];
+            String reference = EXAMPLES[i][1];
+            int level = levelOf(i);
             
             RougeLResult result = calculateRougeL(candidate, reference);
             
-            if (i == 0 || (i == 2) || (i == 4) || (i == 7) || (i == 10) || (i == 12)) {
-                System.out.println("--- Level " + level + ": " + levelNames[level - 1] + " ---");
+            if (i > 0) {
+                out.append(',');
             }
-            
-            System.out.println("Example " + (i + 1) + ":");
-            System.out.println("  Candidate: " + (candidate.length() > 80 ? candidate.substring(0, 77) + "..." : candidate));
-            System.out.println("  Reference: " + (reference.length() > 80 ? reference.substring(0, 77) + "..." : reference));
-            System.out.println("  Result:    " + result);
-            System.out.println();
+            out.append("{\"example_num\":").append(i + 1);
+            out.append(",\"level\":").append(level);
+            out.append(",\"level_name\":");
+            appendJsonString(out, LEVEL_NAMES[level - 1]);
+            out.append(",\"candidate\":");
+            appendJsonString(out, candidate);
+            out.append(",\"reference\":");
+            appendJsonString(out, reference);
+            out.append(",\"f_measure\":");
+            appendJsonNumber(out, result.fMeasure);
+            out.append(",\"precision\":");
+            appendJsonNumber(out, result.precision);
+            out.append(",\"recall\":");
+            appendJsonNumber(out, result.recall);
+            out.append('}');
         }
+        
+        return out.append(']').toString();
+    }
+    
+    /**
+     * Append a number, writing NaN/Infinity (which JSON cannot represent) as null
+     */
+    private static void appendJsonNumber(StringBuilder out, double value) {
+        if (Double.isFinite(value)) {
+            out.append(value);
+        } else {
+            out.append("null");
+        }
+    }
+    
+    /**
+     * Append text as a quoted, escaped JSON string
+     */
+    private static void appendJsonString(StringBuilder out, String text) {
+        out.append('"');
+        for (int i = 0; i < text.length(); i++) {
+            char c = text.charAt(i);
+            switch (c) {
+                case '"': out.append("\\\""); break;
+                case '\\': out.append("\\\\"); break;
+                case '\n': out.append("\\n"); break;
+                case '\r': out.append("\\r"); break;
+                case '\t': out.append("\\t"); break;
+                default:
+                    if (c < 0x20) {
+                        out.append(String.format("\\u%04x", (int) c));
+                    } else {
+                        out.append(c);
+                    }
+            }
+        }
+        out.append('"');
+    }
+    
+    /**
+     * Persistent benchmark worker: reads one command per line from stdin.
+     * "RUN" scores every example and replies "DONE <elapsed_ns>"; "JSON" replies
+     * "JSON <array>" with the results on one line; "QUIT" or EOF exits.
+     */
+    private static void runWorker() throws IOException {
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in));
+        String line;
+        
+        while ((line = in.readLine()) != null) {
+            String command = line.trim();
+            if (command.equals("RUN")) {
+                // Only the scoring loop is timed, not report formatting
+                long start = System.nanoTime();
+                lastResults = scoreAll();
+                long elapsed = System.nanoTime() - start;
+                System.out.println("DONE " + elapsed);
+            } else if (command.equals("JSON")) {
+                System.out.println("JSON " + renderJson());
+            } else if (command.equals("QUIT")) {
+                break;
+            } else {
+                System.out.println("ERROR unknown command: " + command);
+            }
+            System.out.flush();
+        }
+    }
+    
+    /**
+     * Main method for testing
+     */
+    public static void main(String[] args) throws IOException {
+        if (args.length > 0 && args[0].equals("--worker")) {
+            runWorker();
+            return;
+        }
+        
+        // Exercise the scoring path once without output; used to dump the CDS archive
+        if (args.length > 0 && args[0].equals("--dry-run")) {
+            renderReport();
+            return;
+        }
+        
+        if (args.length > 0 && args[0].equals("--json")) {
+            System.out.println(renderJson());
+            return;
+        }
+        
+        System.out.print(renderReport());
     }
 }
-
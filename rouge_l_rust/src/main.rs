@@ -1,3 +1,7 @@
+use std::env;
+use std::fmt::Write as _;
+use std::hint::black_box;
+use std::io::{self, BufRead, Write};
 use std::time::Instant;
 
 /// Calculate the Longest Common Subsequence (LCS) between two sequences
@@ -70,105 +74,121 @@ pub fn calculate_rouge_l(candidate: &str, reference: &str) -> RougeLResult {
     RougeLResult::new(f_measure, precision, recall)
 }
 
-fn main() {
-    // Test examples - progressing from basic to advanced
-    let examples: Vec<(&str, &str)> = vec![
-        // Level 1: Basic Text (Simple sentences)
-        (
-            "The quick brown fox jumps over the lazy dog",
-            "A quick brown fox jumps over a lazy dog"
-        ),
-        (
-            "Machine learning is a subset of artificial intelligence",
-            "Machine learning forms part of artificial intelligence systems"
-        ),
-        
-        // Level 2: Structured Text (Lists, formatting)
-        (
-            "Key features include: security authentication and data encryption",
-            "Main features are: authentication security and encryption of data"
-        ),
-        (
-            "User name: John Doe, Email: john@example.com, Status: Active",
-            "Name: John Doe, Email address: john@example.com, Status: Active user"
-        ),
-        
-        // Level 3: JSON-like structured data
-        (
-            r#"{"user": {"name": "Alice", "age": 30, "city": "New York"}}"#,
-            r#"{"user": {"name": "Alice", "age": 30, "location": "New York"}}"#
-        ),
-        (
-            r#"{"employees": [{"id": 1, "name": "Bob"}, {"id": 2, "name": "Charlie"}]}"#,
-            r#"{"staff": [{"id": 1, "name": "Bob"}, {"id": 2, "name": "Charlie"}]}"#
-        ),
-        (
-            r#"{"status": "success", "data": {"count": 42, "items": ["a", "b"]}}"#,
-            r#"{"result": "success", "payload": {"total": 42, "list": ["a", "b"]}}"#
-        ),
-        
-        // Level 4: HTML content
-        (
-            "<div><h1>Title</h1><p>Content here</p></div>",
-            "<section><h1>Title</h1><p>Content here</p></section>"
-        ),
-        (
-            r#"<a href="/page">Link</a> <img src="photo.jpg" alt="Image">"#,
-            r#"<a href="/page">Link</a> <img src="photo.jpg" alt="Photo">"#
-        ),
-        (
-            "<ul><li>Item 1</li><li>Item 2</li><li>Item 3</li></ul>",
-            "<ol><li>Item 1</li><li>Item 2</li><li>Item 3</li></ol>"
-        ),
-        
-        // Level 5: Mixed complex content (JSON + text)
-        (
-            r#"The API returned {"status": 200, "message": "OK"} with user data"#,
-            r#"API response was {"status": 200, "message": "OK"} containing user information"#
-        ),
-        (
-            r#"Error: {"code": 404, "error": "Not Found"} occurred at 2024-01-15"#,
-            r#"Error occurred: {"code": 404, "error": "Not Found"} on date 2024-01-15"#
-        ),
-        
-        // Level 6: Real-world complex scenarios
-        (
-            "Natural language processing enables computers to understand human language through advanced algorithms",
-            "NLP allows machines to comprehend natural human communication using sophisticated algorithmic approaches"
-        ),
-        (
-            "The cat sat on the mat while the dog played in the yard",
-            "The dog played in the yard while the cat sat on the mat"
-        ),
-        (
-            "POST /api/users HTTP/1.1\nHost: api.example.com\nContent-Type: application/json\n{\"name\": \"Test\"}",
-            "POST /api/users HTTP/1.1\nHost: api.example.com\nContent-Type: application/json\n{\"username\": \"Test\"}"
-        ),
-        (
-            "<html><body><script>console.log('Hello');</script><div>Content</div></body></html>",
-            "<html><body><div>Content</div><script>console.log('Hello');</script></body></html>"
-        )
-    ];
-    
-    let level_names = vec![
-        "Basic Text",
-        "Structured Text",
-        "JSON Data",
-        "HTML Content",
-        "Mixed Content",
-        "Real-world Scenarios"
-    ];
-    
-    println!("=== ROUGE-L Rust Implementation ===\n");
-    println!("Testing {} examples (Basic to Advanced)\n", examples.len());
-    
-    let level_starts = vec![0, 2, 4, 7, 10, 12];
-    
-    for (i, (candidate, reference)) in examples.iter().enumerate() {
+// Test examples - progressing from basic to advanced
+const EXAMPLES: &[(&str, &str)] = &[
+    // Level 1: Basic Text (Simple sentences)
+    (
+        "The quick brown fox jumps over the lazy dog",
+        "A quick brown fox jumps over a lazy dog"
+    ),
+    (
+        "Machine learning is a subset of artificial intelligence",
+        "Machine learning forms part of artificial intelligence systems"
+    ),
+    
+    // Level 2: Structured Text (Lists, formatting)
+    (
+        "Key features include: security authentication and data encryption",
+        "Main features are: authentication security and encryption of data"
+    ),
+    (
+        "User name: John Doe, Email: john@example.com, Status: Active",
+        "Name: John Doe, Email address: john@example.com, Status: Active user"
+    ),
+    
+    // Level 3: JSON-like structured data
+    (
+        r#"{"user": {"name": "Alice", "age": 30, "city": "New York"}}"#,
+        r#"{"user": {"name": "Alice", "age": 30, "location": "New York"}}"#
+    ),
+    (
+        r#"{"employees": [{"id": 1, "name": "Bob"}, {"id": 2, "name": "Charlie"}]}"#,
+        r#"{"staff": [{"id": 1, "name": "Bob"}, {"id": 2, "name": "Charlie"}]}"#
+    ),
+    (
+        r#"{"status": "success", "data": {"count": 42, "items": ["a", "b"]}}"#,
+        r#"{"result": "success", "payload": {"total": 42, "list": ["a", "b"]}}"#
+    ),
+    
+    // Level 4: HTML content
+    (
+        "<div><h1>Title</h1><p>Content here</p></div>",
+        "<section><h1>Title</h1><p>Content here</p></section>"
+    ),
+    (
+        r#"<a href="/page">Link</a> <img src="photo.jpg" alt="Image">"#,
+        r#"<a href="/page">Link</a> <img src="photo.jpg" alt="Photo">"#
+    ),
+    (
+        "<ul><li>Item 1</li><li>Item 2</li><li>Item 3</li></ul>",
+        "<ol><li>Item 1</li><li>Item 2</li><li>Item 3</li></ol>"
+    ),
+    
+    // Level 5: Mixed complex content (JSON + text)
+    (
+        r#"The API returned {"status": 200, "message": "OK"} with user data"#,
+        r#"API response was {"status": 200, "message": "OK"} containing user information"#
+    ),
+    (
+        r#"Error: {"code": 404, "error": "Not Found"} occurred at 2024-01-15"#,
+        r#"Error occurred: {"code": 404, "error": "Not Found"} on date 2024-01-15"#
+    ),
+    
+    // Level 6: Real-world complex scenarios
+    (
+        "Natural language processing enables computers to understand human language through advanced algorithms",
+        "NLP allows machines to comprehend natural human communication using sophisticated algorithmic approaches"
+    ),
+    (
+        "The cat sat on the mat while the dog played in the yard",
+        "The dog played in the yard while the cat sat on the mat"
+    ),
+    (
+        "POST /api/users HTTP/1.1\nHost: api.example.com\nContent-Type: application/json\n{\"name\": \"Test\"}",
+        "POST /api/users HTTP/1.1\nHost: api.example.com\nContent-Type: application/json\n{\"username\": \"Test\"}"
+    ),
+    (
+        "<html><body><script>console.log('Hello');</script><div>Content</div></body></html>",
+        "<html><body><div>Content</div><script>console.log('Hello');</script></body></html>"
+    )
+];
+
+const LEVEL_NAMES: &[&str] = &[
+    "Basic Text",
+    "Structured Text",
+    "JSON Data",
+    "HTML Content",
+    "Mixed Content",
+    "Real-world Scenarios"
+];
+
+const LEVEL_STARTS: &[usize] = &[0, 2, 4, 7, 10, 12];
+
+/// Determine the (1-based) level an example belongs to
+fn level_of(index: usize) -> usize {
+    LEVEL_STARTS.iter().take_while(|&&start| start <= index).count()
+}
+
+/// Score every example; this is the work a worker `RUN` times
+fn score_all() -> Vec<RougeLResult> {
+    EXAMPLES
+        .iter()
+        .map(|(candidate, reference)| calculate_rouge_l(candidate, reference))
+        .collect()
+}
+
+/// Score every example and render the report that main prints
+fn render_report() -> String {
+    let mut out = String::new();
+    
+    writeln!(out, "=== ROUGE-L Rust Implementation ===\n").unwrap();
+    writeln!(out, "Testing {} examples (Basic to Advanced)\n", EXAMPLES.len()).unwrap();
+    
+    for (i, (candidate, reference)) in EXAMPLES.iter().enumerate() {
         // Determine level
-        if let Some(&start_idx) = level_starts.iter().find(|&&idx| i == idx) {
-            let current_level = level_starts.iter().position(|&x| x == start_idx).unwrap() + 1;
-            println!("--- Level {}: {} ---", current_level, level_names[current_level - 1]);
+        if let Some(&start_idx) = LEVEL_STARTS.iter().find(|&&idx| i == idx) {
+            let current_level = LEVEL_STARTS.iter().position(|&x| x == start_idx).unwrap() + 1;
+            writeln!(out, "--- Level {}: {} ---", current_level, LEVEL_NAMES[current_level - 1]).unwrap();
         }
         
         let start = Instant::now();
@@ -187,12 +207,107 @@ fn main() {
             reference.to_string()
         };
         
-        println!("Example {}:", i + 1);
-        println!("  Candidate: {}", candidate_display);
-        println!("  Reference: {}", reference_display);
-        println!("  Result:    F-Measure: {:.4}, Precision: {:.4}, Recall: {:.4}", 
-                 result.f_measure, result.precision, result.recall);
-        println!("  Time:      {:?}\n", duration);
+        writeln!(out, "Example {}:", i + 1).unwrap();
+        writeln!(out, "  Candidate: {}", candidate_display).unwrap();
+        writeln!(out, "  Reference: {}", reference_display).unwrap();
+        writeln!(out, "  Result:    F-Measure: {:.4}, Precision: {:.4}, Recall: {:.4}", 
+                 result.f_measure, result.precision, result.recall).unwrap();
+        writeln!(out, "  Time:      {:?}\n", duration).unwrap();
     }
+    
+    out
 }
 
+/// Append `text` to `out` as a quoted, escaped JSON string
+fn push_json_string(out: &mut String, text: &str) {
+    out.push('"');
+    for c in text.chars() {
+        match c {
+            '"' => out.push_str("\\\""),
+            '\\' => out.push_str("\\\\"),
+            '\n' => out.push_str("\\n"),
+            '\r' => out.push_str("\\r"),
+            '\t' => out.push_str("\\t"),
+            c if (c as u32) < 0x20 => write!(out, "\\u{:04x}", c as u32).unwrap(),
+            c => out.push(c),
+        }
+    }
+    out.push('"');
+}
+
+/// Append `value` to `out`, writing NaN/infinity (which JSON cannot represent) as `null`
+fn push_json_number(out: &mut String, value: f64) {
+    if value.is_finite() {
+        write!(out, "{}", value).unwrap();
+    } else {
+        out.push_str("null");
+    }
+}
+
+/// Score every example and render the results as a single-line JSON array
+fn render_json() -> String {
+    let mut out = String::from("[");
+    
+    for (i, (candidate, reference)) in EXAMPLES.iter().enumerate() {
+        let level = level_of(i);
+        let result = calculate_rouge_l(candidate, reference);
+        
+        if i > 0 {
+            out.push(',');
+        }
+        write!(out, "{{\"example_num\":{},\"level\":{},\"level_name\":", i + 1, level).unwrap();
+        push_json_string(&mut out, LEVEL_NAMES[level - 1]);
+        out.push_str(",\"candidate\":");
+        push_json_string(&mut out, candidate);
+        out.push_str(",\"reference\":");
+        push_json_string(&mut out, reference);
+        out.push_str(",\"f_measure\":");
+        push_json_number(&mut out, result.f_measure);
+        out.push_str(",\"precision\":");
+        push_json_number(&mut out, result.precision);
+        out.push_str(",\"recall\":");
+        push_json_number(&mut out, result.recall);
+        out.push('}');
+    }
+    
+    out.push(']');
+    out
+}
+
+/// Persistent benchmark worker: reads one command per line from stdin.
+/// `RUN` scores every example and replies `DONE <elapsed_ns>`; `JSON` replies
+/// `JSON <array>` with the results on one line; `QUIT` or EOF exits.
+fn run_worker() -> io::Result<()> {
+    let stdin = io::stdin();
+    let mut stdout = io::stdout().lock();
+    
+    for line in stdin.lock().lines() {
+        let line = line?;
+        match line.trim() {
+            "RUN" => {
+                // Only the scoring loop is timed; black_box keeps the optimizer
+                // from discarding results nothing else reads
+                let start = Instant::now();
+                black_box(score_all());
+                let elapsed = start.elapsed();
+                writeln!(stdout, "DONE {}", elapsed.as_nanos())?;
+            }
+            "JSON" => writeln!(stdout, "JSON {}", render_json())?,
+            "QUIT" => break,
+            command => writeln!(stdout, "ERROR unknown command: {}", command)?,
+        }
+        stdout.flush()?;
+    }
+    
+    Ok(())
+}
+
+fn main() -> io::Result<()> {
+    match env::args().nth(1).as_deref() {
+        Some("--worker") => return run_worker(),
+        Some("--json") => println!("{}", render_json()),
+        _ => print!("{}", render_report()),
+    }
+    
+    Ok(())
+}
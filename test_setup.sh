@@ -24,6 +24,11 @@ fi
 echo "Checking Python..."
 if command -v python3 &> /dev/null; then
     echo "  ✓ Python found: $(python3 --version)"
+    if python3 -c "import numpy" &> /dev/null; then
+        echo "  ✓ NumPy found: $(python3 -c 'import numpy; print(numpy.__version__)')"
+    else
+        echo "  ✗ NumPy not found (pip install numpy)"
+    fi
 else
     echo "  ✗ Python not found"
 fi
@@ -47,6 +52,22 @@ for file in "${required_files[@]}"; do
     fi
 done
 
+# Check that a null (non-finite) score is reported as a mismatch rather than crashing
+echo ""
+echo "Checking comparison script..."
+if python3 - <<'PY' &> /dev/null
+from compare_rouge_l import compare_results
+ok = {"level": 1, "f_measure": 0.5, "precision": 0.5, "recall": 0.5}
+null = dict(ok, f_measure=None)
+_, _, _, match_mask = compare_results([ok, null], [ok, ok])
+assert match_mask.tolist() == [True, False]
+PY
+then
+    echo "  ✓ Null scores are reported as mismatches"
+else
+    echo "  ✗ compare_results failed on a null score"
+fi
+
 echo ""
 echo "=== Verification Complete ==="
 echo ""